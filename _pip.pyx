@@ -0,0 +1,26 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""Compiled exact point-in-polygon test (winding number).
+
+Optional fast path for interpreters without numba; the simulator falls
+back to pure NumPy when this module is not built. Build in place with:
+
+    python setup.py build_ext --inplace
+"""
+
+cpdef bint pip(double[:, ::1] poly, double x, double y):
+    cdef Py_ssize_t n = poly.shape[0]
+    cdef Py_ssize_t i, j
+    cdef int wn = 0
+    cdef double xi, yi, xj, yj, is_left
+    j = n - 1
+    for i in range(n):
+        xi = poly[i, 0]; yi = poly[i, 1]
+        xj = poly[j, 0]; yj = poly[j, 1]
+        is_left = (xj - xi) * (y - yi) - (yj - yi) * (x - xi)
+        if yi <= y:
+            if yj > y and is_left > 0:
+                wn += 1
+        elif yj <= y and is_left < 0:
+            wn -= 1
+        j = i
+    return wn != 0
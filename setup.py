@@ -0,0 +1,9 @@
+from setuptools import setup
+from Cython.Build import cythonize
+
+# builds the optional compiled point-in-polygon extension (_pip.pyx);
+# the simulator runs without it, using numba or pure NumPy instead
+setup(
+    name="virtual-fence-simulator",
+    ext_modules=cythonize("_pip.pyx", language_level=3),
+)
@@ -10,7 +10,8 @@ Features:
  - Save/load fence + config to JSON.
  - Export alerts to CSV.
  - Live dashboard showing counts inside/outside and alerts log.
- - Point-in-polygon detection (ray casting).
+ - Point-in-polygon detection (vectorized winding number over all animals at once).
+ - Optional numba JIT for the per-tick physics + containment kernel.
 
 Usage:
     python3 virtual_fence_simulator_polygonal.py
@@ -19,6 +20,20 @@ Usage:
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, colorchooser
 import random, math, time, csv, json, os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the pure-NumPy kernel
+    njit = None
+
+try:
+    from _pip import pip as _pip  # compiled exact test, see _pip.pyx / setup.py
+except ImportError:
+    _pip = None
 
 # Default configuration
 DEFAULT_CANVAS_W = 900
@@ -28,32 +43,202 @@ DEFAULT_ANIMAL_COUNT = 8
 DEFAULT_SPEED = 1.0
 DEFAULT_ANIMAL_SIZE = 6
 DEFAULT_FENCE_COLOR = "#2563eb"
-
-class Animal:
-    def __init__(self, aid, x, y, speed_multiplier=1.0):
-        self.id = aid
-        self.x = x
-        self.y = y
-        # velocity direction random
-        angle = random.uniform(0, 2*math.pi)
-        self.vx = math.cos(angle)
-        self.vy = math.sin(angle)
-        self.base_speed = random.uniform(0.6, 1.8)
-        self.speed_multiplier = speed_multiplier
-        self.inside = True
-        self.canvas_obj = None
-
-    def step(self):
-        speed = self.base_speed * self.speed_multiplier
-        # add small random wandering
-        self.vx += random.uniform(-0.25, 0.25)
-        self.vy += random.uniform(-0.25, 0.25)
-        # normalize
-        n = max(1e-6, math.hypot(self.vx, self.vy))
-        self.vx = (self.vx / n) * speed
-        self.vy = (self.vy / n) * speed
-        self.x += self.vx
-        self.y += self.vy
+PIP_GRID_CELLS = 64  # occupancy-grid resolution for point-in-polygon queries
+
+def _winding(x, y, xi, yi, yj, dx, dy):
+    # Vectorized winding number (Sunday's signed crossing rule), testing
+    # every point against every fence edge in one shot. Unlike parity ray
+    # casting it stays correct on self-intersecting fences a user might
+    # draw, and needs no division per edge.
+    px = x[:, None]; py = y[:, None]
+    is_left = dx[None, :] * (py - yi[None, :]) - dy[None, :] * (px - xi[None, :])
+    up = (yi[None, :] <= py) & (yj[None, :] > py) & (is_left > 0)
+    down = (yi[None, :] > py) & (yj[None, :] <= py) & (is_left < 0)
+    return (up.sum(axis=1) - down.sum(axis=1)) != 0
+
+def _points_in_polygon(x, y, xi, yi, yj, dx, dy, minx, miny, maxx, maxy,
+                       grid, ginvx, ginvy):
+    # Points outside the polygon's bounding box are rejected with four
+    # comparisons; the rest look up the occupancy grid, and only points in
+    # boundary cells (value 2) run the exact winding test.
+    inside = np.zeros(x.size, dtype=np.bool_)
+    box = (x >= minx) & (x <= maxx) & (y >= miny) & (y <= maxy)
+    if box.any():
+        bx = x[box]; by = y[box]
+        gx = np.minimum(((bx - minx) * ginvx).astype(np.intp), grid.shape[1] - 1)
+        gy = np.minimum(((by - miny) * ginvy).astype(np.intp), grid.shape[0] - 1)
+        cell = grid[gy, gx]
+        res = cell == 1
+        hard = cell == 2
+        if hard.any():
+            hx = bx[hard]; hy = by[hard]
+            if _pip is not None:
+                # compiled C loop per point (this path only runs when numba
+                # is absent, so the extension is the fast exact test)
+                poly = np.column_stack((xi, yi))
+                res[hard] = np.fromiter((_pip(poly, hx[i], hy[i]) for i in range(hx.size)),
+                                        count=hx.size, dtype=np.bool_)
+            else:
+                res[hard] = _winding(hx, hy, xi, yi, yj, dx, dy)
+        inside[box] = res
+    return inside
+
+def _tick_kernel_numpy(x, y, vx, vy, base_speed, mult, w, h,
+                       poly_xi, poly_yi, poly_yj, poly_dx, poly_dy,
+                       minx, miny, maxx, maxy, grid, ginvx, ginvy, rand_buf):
+    # Pure-NumPy tick update, used when numba is not installed: wander,
+    # normalize, advance, soft bounce off the canvas edges, then the
+    # winding-number containment test.
+    speed = base_speed * mult
+    vx += rand_buf[:, 0]
+    vy += rand_buf[:, 1]
+    # normalize via one reciprocal sqrt; the epsilon keeps a zero vector finite
+    inv = speed / np.sqrt(vx*vx + vy*vy + 1e-12)
+    vx *= inv
+    vy *= inv
+    x += vx
+    y += vy
+    # branch-free bounce: clamp to the canvas and flip/damp the velocity
+    # of every clamped lane in one masked multiply
+    oob = (x < 5) | (x > w-5)
+    np.clip(x, 5, w-5, out=x)
+    vx *= np.where(oob, -0.6, 1.0)
+    oob = (y < 5) | (y > h-5)
+    np.clip(y, 5, h-5, out=y)
+    vy *= np.where(oob, -0.6, 1.0)
+    if poly_xi.size:
+        return _points_in_polygon(x, y, poly_xi, poly_yi, poly_yj,
+                                  poly_dx, poly_dy, minx, miny, maxx, maxy,
+                                  grid, ginvx, ginvy)
+    return np.ones(x.size, dtype=np.bool_)
+
+def _tick_kernel_scalar(x, y, vx, vy, base_speed, mult, w, h,
+                        poly_xi, poly_yi, poly_yj, poly_dx, poly_dy,
+                        minx, miny, maxx, maxy, grid, ginvx, ginvy, rand_buf):
+    # Same update as _tick_kernel_numpy written as plain loops so numba can
+    # compile it; interpreter dispatch disappears and LLVM vectorizes the math.
+    n = x.size
+    nv = poly_xi.size
+    inside = np.ones(n, dtype=np.bool_)
+    xl = 5.0; xr = w - 5.0
+    yl = 5.0; yr = h - 5.0
+    for i in range(n):
+        speed = base_speed[i] * mult[i]
+        vxi = vx[i] + rand_buf[i, 0]
+        vyi = vy[i] + rand_buf[i, 1]
+        # normalize via one reciprocal sqrt (rsqrt + FMA under fastmath);
+        # the epsilon keeps a zero vector finite
+        inv = speed / math.sqrt(vxi*vxi + vyi*vyi + 1e-12)
+        vxi *= inv
+        vyi *= inv
+        px = x[i] + vxi
+        py = y[i] + vyi
+        # branch-free bounce: clamp, then scale velocity by -0.6 exactly
+        # when the clamp engaged (1.0 - 1.6*mask is 1.0 or -0.6)
+        ox = (px < xl) | (px > xr)
+        px = min(max(px, xl), xr)
+        vxi *= 1.0 - 1.6 * ox
+        oy = (py < yl) | (py > yr)
+        py = min(max(py, yl), yr)
+        vyi *= 1.0 - 1.6 * oy
+        if nv:
+            # bounding-box reject, then the occupancy-grid lookup; only
+            # boundary cells (value 2) fall through to the exact edge loop
+            if px < minx or px > maxx or py < miny or py > maxy:
+                inside[i] = False
+            else:
+                gx = int((px - minx) * ginvx)
+                if gx > grid.shape[1] - 1:
+                    gx = grid.shape[1] - 1
+                gy = int((py - miny) * ginvy)
+                if gy > grid.shape[0] - 1:
+                    gy = grid.shape[0] - 1
+                cell = grid[gy, gx]
+                if cell != 2:
+                    inside[i] = cell == 1
+                else:
+                    wn = 0
+                    for k in range(nv):
+                        il = poly_dx[k] * (py - poly_yi[k]) - poly_dy[k] * (px - poly_xi[k])
+                        if poly_yi[k] <= py:
+                            if poly_yj[k] > py and il > 0.0:
+                                wn += 1
+                        elif poly_yj[k] <= py and il < 0.0:
+                            wn -= 1
+                    inside[i] = wn != 0
+        x[i] = px; y[i] = py
+        vx[i] = vxi; vy[i] = vyi
+    return inside
+
+if njit is not None:
+    _tick_kernel = njit(cache=True, fastmath=True)(_tick_kernel_scalar)
+else:
+    _tick_kernel = _tick_kernel_numpy
+
+class AnimalPool:
+    """Struct-of-arrays animal store.
+
+    Every per-animal field is a preallocated NumPy array indexed by slot;
+    capacity doubles when full and freed slots are reused via the `alive`
+    bitmap, so adds/removes never reallocate the buffers the tick kernel
+    reads.
+    """
+
+    _FIELDS = ("x", "y", "drawn_x", "drawn_y", "vx", "vy", "base_speed",
+               "mult", "inside", "canvas_obj", "id", "alive")
+
+    def __init__(self, capacity=16):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.drawn_x = np.zeros(capacity)  # position last pushed to the canvas
+        self.drawn_y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.base_speed = np.zeros(capacity)
+        self.mult = np.zeros(capacity)
+        self.inside = np.zeros(capacity, dtype=bool)
+        self.canvas_obj = np.zeros(capacity, dtype=np.int64)
+        self.id = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def _grow(self):
+        new_cap = self.capacity * 2
+        for name in self._FIELDS:
+            arr = getattr(self, name)
+            grown = np.zeros(new_cap, dtype=arr.dtype)
+            grown[:self.capacity] = arr
+            setattr(self, name, grown)
+        self.capacity = new_cap
+
+    def add(self, aid, x, y, vx, vy, base_speed, mult):
+        free = np.flatnonzero(~self.alive)
+        if free.size == 0:
+            self._grow()
+            free = np.flatnonzero(~self.alive)
+        slot = int(free[0])
+        self.x[slot] = x
+        self.y[slot] = y
+        self.drawn_x[slot] = x
+        self.drawn_y[slot] = y
+        self.vx[slot] = vx
+        self.vy[slot] = vy
+        self.base_speed[slot] = base_speed
+        self.mult[slot] = mult
+        self.inside[slot] = True
+        self.canvas_obj[slot] = 0
+        self.id[slot] = aid
+        self.alive[slot] = True
+        return slot
+
+    def remove(self, slot):
+        self.alive[slot] = False
+
+    def alive_indices(self):
+        return np.flatnonzero(self.alive)
 
 class VirtualFenceApp(tk.Tk):
     def __init__(self):
@@ -72,13 +257,47 @@ class VirtualFenceApp(tk.Tk):
         self.show_coords = tk.BooleanVar(value=False)
 
         self._build_ui()
-        self.animals = {}
+        # cached bound method for raw Tcl calls; skips Canvas.coords' option
+        # parsing when pushing per-animal positions every tick
+        self._tkcall = self.tk.call
+        # cached canvas size / animal radius; cget() and IntVar.get() are Tcl
+        # round-trips, so the tick loop reads these plain attributes instead
+        # and they are refreshed only when the underlying values change
+        self._w = self.canvas_w.get()
+        self._h = self.canvas_h.get()
+        self._r = self.animal_size.get()
+        self.animal_size.trace_add('write', self._on_animal_size_changed)
+        # animal state lives in the SoA pool so the tick loop works on
+        # contiguous buffers instead of per-animal objects
+        self.pool = AnimalPool()
         self.next_animal_id = 1
+        self._rng = np.random.default_rng()
+        self._wander = np.empty((0, 2))  # scratch for the per-tick wander randoms
+        # single worker running the numeric kernel off the Tk event loop;
+        # NumPy/numba release the GIL, so input keeps being processed
+        self._exec = ThreadPoolExecutor(max_workers=1)
+        self._tick_inflight = False
+        self._tick_gen = 0  # generation counter to drop superseded results
         self.sim_running = False
         self._job = None
         self.alerts = []  # (timestamp, id, x, y, msg)
-        self.polygon_points = []  # list of (x,y) while drawing
-        self.fence_polygon_id = None  # canvas polygon id for drawn/active fence
+        self._pending_alerts = []  # LEFT messages awaiting one coalesced popup
+        self._alert_scheduled = False
+        self._log_buf = deque(maxlen=500)  # bounded log history
+        self._log_flush_job = None
+        self._grid_img = None   # PhotoImage backing the grid; Tk keeps no reference
+        self._grid_size = None
+        self.polygon_points = []  # list of (x,y) while drawing / for JSON
+        # single reusable fence item: created hidden once, then updated in
+        # place via coords/itemconfig instead of delete + create_polygon
+        self.fence_polygon_id = self.canvas.create_polygon(
+            0, 0, 0, 0, 0, 0, outline="", width=3, fill="", dash=(6,4),
+            tags=("fence",), state="hidden")
+        self._poly_np = None     # canonical fence vertices, C-contiguous (V,2) float64
+        self._poly_edges = None  # cached edge arrays for the winding test
+        self._poly_aabb = None   # fence bounding box (minx, miny, maxx, maxy)
+        self._poly_grid = None   # coarse occupancy grid (0/1/2 = out/in/boundary)
+        self._poly_grid_inv = None  # world->grid scale factors
 
         # draw grid and subscribe
         self._draw_grid()
@@ -176,31 +395,47 @@ class VirtualFenceApp(tk.Tk):
         ttk.Label(ctrl_frame, text="Tip: Draw polygon then Finish & Activate. Animals turn red when outside.").grid(row=12, column=0, sticky="w", pady=(8,0))
 
     def _draw_grid(self):
-        # clear any grid lines (canvas may be resized)
-        self.canvas.delete("grid_line")
+        # one image item instead of ~(w+h)/50 line items, so the grid adds a
+        # single object to every canvas redraw; unset pixels stay transparent
+        # and the canvas background shows through
         step = 50
         w = self.canvas.winfo_reqwidth()
         h = self.canvas.winfo_reqheight()
+        if self._grid_size == (w, h):
+            return
+        img = tk.PhotoImage(width=w, height=h)
         for x in range(0, w, step):
-            self.canvas.create_line(x, 0, x, h, fill="#f1f5f9", tags=("grid_line",))
+            img.put("#f1f5f9", to=(x, 0, x+1, h))
         for y in range(0, h, step):
-            self.canvas.create_line(0, y, w, y, fill="#f1f5f9", tags=("grid_line",))
+            img.put("#f1f5f9", to=(0, y, w, y+1))
+        self._grid_img = img
+        self._grid_size = (w, h)
+        self.canvas.delete("grid_line")
+        self.canvas.create_image(0, 0, image=self._grid_img, anchor="nw", tags=("grid_line",))
+        self.canvas.tag_lower("grid_line")
 
     def apply_canvas_size(self):
         w = max(200, int(self.canvas_w.get()))
         h = max(150, int(self.canvas_h.get()))
         self.canvas.config(width=w, height=h)
+        self._w = w
+        self._h = h
         self._draw_grid()
         self.log(f"Applied canvas size {w}x{h}")
 
+    def _on_animal_size_changed(self, *_args):
+        try:
+            self._r = self.animal_size.get()
+        except tk.TclError:
+            pass  # entry may hold a partial/invalid value while typing
+
     def choose_color(self):
         c = colorchooser.askcolor(color=self.fence_color.get(), title="Choose fence color")
         if c and c[1]:
             self.fence_color.set(c[1])
             self.color_preview.config(bg=c[1])
-            # update active polygon color if exists
-            if self.fence_polygon_id:
-                self.canvas.itemconfig(self.fence_polygon_id, outline=self.fence_color.get())
+            # recolor the persistent fence item (a no-op while hidden)
+            self.canvas.itemconfig(self.fence_polygon_id, outline=self.fence_color.get())
 
     def toggle_draw_mode(self):
         val = not self.draw_mode.get()
@@ -208,6 +443,7 @@ class VirtualFenceApp(tk.Tk):
         if val:
             self.draw_btn.config(text="Drawing... (Click to add)")
             self.polygon_points = []
+            self._rebuild_poly_edges()
             # remove temporary items
             self._clear_temp_shapes()
             self.log("Drawing mode enabled: click on canvas to add polygon vertices.")
@@ -225,6 +461,7 @@ class VirtualFenceApp(tk.Tk):
         if self.draw_mode.get():
             # add point
             self.polygon_points.append((event.x, event.y))
+            self._rebuild_poly_edges()
             # draw small marker
             r = 3
             self.canvas.create_oval(event.x-r, event.y-r, event.x+r, event.y+r, fill="#111827", tags=("poly_point",))
@@ -253,66 +490,74 @@ class VirtualFenceApp(tk.Tk):
         if len(self.polygon_points) < 3:
             messagebox.showwarning("Invalid polygon", "A polygon needs at least 3 points.")
             return
-        # remove existing fence polygon if any
-        if self.fence_polygon_id:
-            self.canvas.delete(self.fence_polygon_id)
-            self.fence_polygon_id = None
-        # draw filled polygon with outline
+        # reshape and show the persistent fence item
         flat = [coord for pt in self.polygon_points for coord in pt]
-        self.fence_polygon_id = self.canvas.create_polygon(*flat, outline=self.fence_color.get(), width=3, fill="", dash=(6,4), tags=("fence",))
+        self.canvas.coords(self.fence_polygon_id, *flat)
+        self.canvas.itemconfig(self.fence_polygon_id, outline=self.fence_color.get(), state="normal")
+        self._rebuild_poly_edges()
         self._clear_temp_shapes()
         self.draw_mode.set(False)
         self.draw_btn.config(text="Start Drawing Fence")
         self.log(f"Fence activated with {len(self.polygon_points)} vertices.")
 
     def clear_fence(self):
-        if self.fence_polygon_id:
-            self.canvas.delete(self.fence_polygon_id)
-            self.fence_polygon_id = None
+        self.canvas.itemconfig(self.fence_polygon_id, state="hidden")
         self.polygon_points = []
+        self._rebuild_poly_edges()
         self._clear_temp_shapes()
         self.log("Fence cleared.")
 
     def add_random_animal(self):
-        w = int(self.canvas.cget("width"))
-        h = int(self.canvas.cget("height"))
+        w = self._w
+        h = self._h
         # spawn away from edges
         x = random.uniform(40, max(40, w-40))
         y = random.uniform(40, max(40, h-40))
         self._create_animal(x, y)
 
     def add_animal_at_center(self):
-        w = int(self.canvas.cget("width"))
-        h = int(self.canvas.cget("height"))
-        self._create_animal(w/2 + random.uniform(-10,10), h/2 + random.uniform(-10,10))
+        self._create_animal(self._w/2 + random.uniform(-10,10), self._h/2 + random.uniform(-10,10))
 
     def _create_animal(self, x, y):
         aid = self.next_animal_id
         self.next_animal_id += 1
-        a = Animal(aid, x, y, speed_multiplier=self.speed_mul.get())
-        r = self.animal_size.get()
-        a.canvas_obj = self.canvas.create_oval(a.x-r, a.y-r, a.x+r, a.y+r, fill="#10b981", outline="#065f46", width=1, tags=(f"animal_{aid}",))
-        self.animals[aid] = a
-        self.log(f"Added animal #{aid} at ({int(a.x)},{int(a.y)})")
+        # velocity direction random
+        angle = random.uniform(0, 2*math.pi)
+        slot = self.pool.add(aid, x, y, math.cos(angle), math.sin(angle),
+                             random.uniform(0.6, 1.8), self.speed_mul.get())
+        r = self._r
+        # the "inside"/"outside" tag tracks fence state so colors can be
+        # pushed with one itemconfig per group instead of one per animal
+        obj = self.canvas.create_oval(x-r, y-r, x+r, y+r, fill="#10b981", outline="#065f46", width=1, tags=(f"animal_{aid}", "inside"))
+        self.pool.canvas_obj[slot] = obj
+        self.log(f"Added animal #{aid} at ({int(x)},{int(y)})")
         self._update_counts()
+        return slot
 
     def remove_last_animal(self):
-        if not self.animals:
+        idx = self.pool.alive_indices()
+        if idx.size == 0:
             return
-        last = max(self.animals.keys())
-        a = self.animals.pop(last)
-        if a.canvas_obj:
-            self.canvas.delete(a.canvas_obj)
+        slot = idx[np.argmax(self.pool.id[idx])]
+        last = int(self.pool.id[slot])
+        obj = int(self.pool.canvas_obj[slot])
+        if obj:
+            self.canvas.delete(obj)
+        self.pool.remove(slot)
         self.log(f"Removed animal #{last}")
         self._update_counts()
 
+    def _clear_animals(self):
+        for slot in self.pool.alive_indices():
+            obj = int(self.pool.canvas_obj[slot])
+            if obj:
+                self.canvas.delete(obj)
+        self.pool = AnimalPool()
+        self.next_animal_id = 1
+
     def reset_animals(self):
         # remove all and add initial number
-        for a in list(self.animals.values()):
-            if a.canvas_obj:
-                self.canvas.delete(a.canvas_obj)
-        self.animals = {}
-        self.next_animal_id = 1
+        self._clear_animals()
         for _ in range(max(0, int(self.init_animal_count.get()))):
             self.add_random_animal()
         self.log("Reset animals to initial count.")
@@ -325,8 +570,7 @@ class VirtualFenceApp(tk.Tk):
         self.start_btn.config(state="disabled")
         self.stop_btn.config(state="normal")
         # apply speed multiplier to animals
-        for a in self.animals.values():
-            a.speed_multiplier = self.speed_mul.get()
+        self.pool.mult[:] = self.speed_mul.get()
         self._tick_loop()
 
     def stop_simulation(self):
@@ -339,74 +583,224 @@ class VirtualFenceApp(tk.Tk):
             self.after_cancel(self._job)
             self._job = None
 
+    def _rebuild_poly_edges(self):
+        # cache the fence edge arrays (with precomputed dx/dy deltas) plus
+        # the bounding box for the vectorized winding test
+        if len(self.polygon_points) >= 3:
+            # the contiguous array is the canonical form; the tuple list is
+            # only kept for drawing and JSON round-trips
+            poly = np.ascontiguousarray(np.asarray(self.polygon_points, dtype=np.float64))
+            self._poly_np = poly
+            xi = poly[:, 0]; yi = poly[:, 1]
+            xj = np.roll(xi, 1); yj = np.roll(yi, 1)
+            dx = xj - xi; dy = yj - yi
+            self._poly_edges = (xi, yi, yj, dx, dy)
+            minx = xi.min(); miny = yi.min(); maxx = xi.max(); maxy = yi.max()
+            self._poly_aabb = (minx, miny, maxx, maxy)
+            # rasterize a coarse occupancy grid over the bounding box:
+            # 0 = wholly outside, 1 = wholly inside, 2 = boundary (needs the
+            # exact winding test). Cell corners are classified with the
+            # vectorized winding test, then every cell an edge passes through
+            # (plus one cell of dilation) is marked boundary.
+            g = PIP_GRID_CELLS
+            spanx = max(maxx - minx, 1e-9)
+            spany = max(maxy - miny, 1e-9)
+            cx, cy = np.meshgrid(np.linspace(minx, maxx, g + 1),
+                                 np.linspace(miny, maxy, g + 1))
+            corners = _winding(cx.ravel(), cy.ravel(),
+                               xi, yi, yj, dx, dy).reshape(g + 1, g + 1)
+            hits = (corners[:-1, :-1].astype(np.uint8) + corners[:-1, 1:] +
+                    corners[1:, :-1] + corners[1:, 1:])
+            grid = np.full((g, g), 2, dtype=np.uint8)
+            grid[hits == 0] = 0
+            grid[hits == 4] = 1
+            t = np.linspace(0.0, 1.0, 2 * g)
+            ex = xi[:, None] + dx[:, None] * t[None, :]
+            ey = yi[:, None] + dy[:, None] * t[None, :]
+            egx = np.minimum(((ex.ravel() - minx) / spanx * g).astype(np.intp), g - 1)
+            egy = np.minimum(((ey.ravel() - miny) / spany * g).astype(np.intp), g - 1)
+            grid[egy, egx] = 2
+            border = grid == 2
+            dil = border.copy()
+            dil[1:, :] |= border[:-1, :]; dil[:-1, :] |= border[1:, :]
+            dil[:, 1:] |= border[:, :-1]; dil[:, :-1] |= border[:, 1:]
+            grid[dil] = 2
+            self._poly_grid = grid
+            self._poly_grid_inv = (g / spanx, g / spany)
+        else:
+            self._poly_np = None
+            self._poly_edges = None
+            self._poly_aabb = None
+            self._poly_grid = None
+            self._poly_grid_inv = None
+
     def _tick_loop(self):
-        # update all animals and check polygon inclusion
-        for a in list(self.animals.values()):
-            a.step()
-            # keep inside canvas with soft bounce
-            w = int(self.canvas.cget("width"))
-            h = int(self.canvas.cget("height"))
-            if a.x < 5: a.x = 5; a.vx *= -0.6
-            if a.x > w-5: a.x = w-5; a.vx *= -0.6
-            if a.y < 5: a.y = 5; a.vy *= -0.6
-            if a.y > h-5: a.y = h-5; a.vy *= -0.6
-            # determine if inside fence polygon (if exists)
-            inside = True
-            if self.fence_polygon_id or len(self.polygon_points) >= 3:
-                poly = self.polygon_points if self.polygon_points and self.fence_polygon_id is None else self._get_active_polygon_points()
-                inside = self.point_in_polygon(a.x, a.y, poly) if poly else True
-            # update drawing and state
-            r = self.animal_size.get()
-            color = "#10b981" if inside else "#ef4444"
-            outline = "#065f46" if inside else "#7f1d1d"
-            self.canvas.coords(a.canvas_obj, a.x-r, a.y-r, a.x+r, a.y+r)
-            self.canvas.itemconfig(a.canvas_obj, fill=color, outline=outline)
-            if not inside and a.inside:
-                # left
-                a.inside = False
-                msg = f"Animal #{a.id} LEFT fence at ({int(a.x)},{int(a.y)})"
-                self.alerts.append((time.strftime("%Y-%m-%d %H:%M:%S"), a.id, int(a.x), int(a.y), msg))
-                self.log(msg)
-                # non-blocking popup
-                self.after(10, lambda m=msg: messagebox.showwarning("ALERT", m))
-            if inside and not a.inside:
-                a.inside = True
-                msg = f"Animal #{a.id} re-entered fence at ({int(a.x)},{int(a.y)})"
-                self.alerts.append((time.strftime("%Y-%m-%d %H:%M:%S"), a.id, int(a.x), int(a.y), msg))
-                self.log(msg)
+        # gather this tick's inputs and hand the numeric kernel to the
+        # worker thread; _apply_tick runs on the Tk thread once it is done
+        self._job = None
+        idx = self.pool.alive_indices()
+        n = idx.size
+        if n == 0 or self._tick_inflight:
+            self._update_counts()
+            self._reschedule_tick()
+            return
+        w = self._w
+        h = self._h
+        # pre-draw the wander randoms in bulk into a reused scratch
+        # buffer; the kernel itself is pure numeric
+        if self._wander.shape[0] != n:
+            self._wander = np.empty((n, 2))
+        rand_buf = self._wander
+        self._rng.random(out=rand_buf)
+        rand_buf *= 0.5   # map [0,1) onto [-0.25,0.25)
+        rand_buf -= 0.25
+        if self._poly_edges is not None:
+            xi, yi, yj, dx, dy = self._poly_edges
+            minx, miny, maxx, maxy = self._poly_aabb
+            grid = self._poly_grid
+            ginvx, ginvy = self._poly_grid_inv
+        else:
+            xi = yi = yj = dx = dy = np.empty(0)
+            minx = miny = maxx = maxy = 0.0
+            grid = np.zeros((1, 1), dtype=np.uint8)
+            ginvx = ginvy = 0.0
+        # the gathered slot copies double as the kernel's scratch; they are
+        # scattered back in _apply_tick
+        pool = self.pool
+        args = (pool.x[idx], pool.y[idx], pool.vx[idx], pool.vy[idx],
+                pool.base_speed[idx], pool.mult[idx],
+                float(w), float(h), xi, yi, yj, dx, dy,
+                minx, miny, maxx, maxy, grid, ginvx, ginvy, rand_buf)
+        self._tick_inflight = True
+        self._tick_gen += 1
+        gen = self._tick_gen
+        fut = self._exec.submit(_tick_kernel, *args)
+        fut.add_done_callback(
+            lambda f, gen=gen, pool=pool, idx=idx, args=args:
+                self.after_idle(self._apply_tick, gen, pool, idx, args, f))
+
+    def _apply_tick(self, gen, pool, idx, args, fut):
+        # back on the Tk thread: scatter kernel results, update the canvas
+        # and emit alerts
+        if gen == self._tick_gen:
+            self._tick_inflight = False
+        if gen != self._tick_gen or pool is not self.pool:
+            # superseded tick, or reset/load swapped the pool out while the
+            # kernel ran (idx would index the wrong arrays): drop the result
+            # but keep the tick chain alive
+            self._reschedule_tick()
+            return
+        inside_now = np.asarray(fut.result())
+        px_a, py_a, vx_a, vy_a = args[0], args[1], args[2], args[3]
+        # animals may have been removed while the kernel ran; only touch
+        # slots that are still alive
+        ok = pool.alive[idx]
+        if not ok.all():
+            idx = idx[ok]
+            px_a = px_a[ok]; py_a = py_a[ok]
+            vx_a = vx_a[ok]; vy_a = vy_a[ok]
+            inside_now = inside_now[ok]
+        n = idx.size
+        if n:
+            pool.x[idx] = px_a; pool.y[idx] = py_a
+            pool.vx[idx] = vx_a; pool.vy[idx] = vy_a
+            # push positions through the cached raw Tcl call, but only for
+            # animals that moved a visible amount (>= 1 px) or changed
+            # color state; sub-pixel movers keep their last drawn position
+            r = self._r
+            tkcall = self._tkcall
+            cw = self.canvas._w
+            objs = pool.canvas_obj[idx]
+            flipped = inside_now != pool.inside[idx]
+            moved = (np.abs(px_a - pool.drawn_x[idx]) +
+                     np.abs(py_a - pool.drawn_y[idx])) >= 1.0
+            push = np.flatnonzero(moved | flipped)
+            for i in push:
+                px = px_a[i]; py = py_a[i]
+                tkcall(cw, 'coords', int(objs[i]), px-r, py-r, px+r, py+r)
+            sel = idx[push]
+            pool.drawn_x[sel] = px_a[push]
+            pool.drawn_y[sel] = py_a[push]
+            # diff against the previous mask to emit LEFT / re-enter alerts
+            # and move flipped animals between the inside/outside tag groups
+            changed = np.flatnonzero(flipped)
+            if changed.size:
+                # one strftime per tick; every event this tick shares it
+                ts_full = time.strftime("%Y-%m-%d %H:%M:%S")
+                ts_short = ts_full[11:]
+            for i in changed:
+                aid = int(pool.id[idx[i]])
+                obj = int(objs[i])
+                x = int(px_a[i]); y = int(py_a[i])
+                if not inside_now[i]:
+                    # left
+                    self.canvas.dtag(obj, "inside")
+                    self.canvas.addtag_withtag("outside", obj)
+                    msg = f"Animal #{aid} LEFT fence at ({x},{y})"
+                    self.alerts.append((ts_full, aid, x, y, msg))
+                    self.log(msg, ts=ts_short)
+                    self._pending_alerts.append(msg)
+                else:
+                    self.canvas.dtag(obj, "outside")
+                    self.canvas.addtag_withtag("inside", obj)
+                    msg = f"Animal #{aid} re-entered fence at ({x},{y})"
+                    self.alerts.append((ts_full, aid, x, y, msg))
+                    self.log(msg, ts=ts_short)
+            if changed.size:
+                # two tag-group calls recolor every flipped animal at once
+                self.canvas.itemconfig("inside", fill="#10b981", outline="#065f46")
+                self.canvas.itemconfig("outside", fill="#ef4444", outline="#7f1d1d")
+            pool.inside[idx] = inside_now
+            # one popup per tick covering every animal that left; scheduling
+            # a dialog per animal stacks modal windows and stalls the loop
+            if self._pending_alerts and not self._alert_scheduled:
+                self._alert_scheduled = True
+                self.after(10, self._flush_alerts)
         self._update_counts()
-        if self.sim_running:
+        self._reschedule_tick()
+
+    def _reschedule_tick(self):
+        # at most one pending after-callback may exist: a stop/start while
+        # a kernel is in flight would otherwise fork a second tick chain
+        # (one scheduled by _tick_loop's in-flight branch, one by
+        # _apply_tick), doubling the tick rate beyond stop_simulation's
+        # reach
+        if self.sim_running and self._job is None:
             self._job = self.after(max(10, int(self.tick_ms.get())), self._tick_loop)
 
-    def _get_active_polygon_points(self):
-        if self.fence_polygon_id and self.polygon_points:
-            return self.polygon_points
-        return None
-
-    def point_in_polygon(self, x, y, poly):
-        # Ray casting algorithm for point-in-polygon
-        # poly = list of (x,y) tuples
-        if not poly: return True
-        inside = False
-        n = len(poly)
-        j = n - 1
-        for i in range(n):
-            xi, yi = poly[i]; xj, yj = poly[j]
-            intersect = ((yi > y) != (yj > y)) and (x < (xj - xi) * (y - yi) / (yj - yi + 1e-12) + xi)
-            if intersect:
-                inside = not inside
-            j = i
-        return inside
+    def _flush_alerts(self):
+        # show all alerts buffered since the last flush in a single dialog
+        self._alert_scheduled = False
+        if not self._pending_alerts:
+            return
+        msgs = self._pending_alerts
+        self._pending_alerts = []
+        if len(msgs) == 1:
+            messagebox.showwarning("ALERT", msgs[0])
+        else:
+            messagebox.showwarning("ALERT", f"{len(msgs)} animals left the fence:\n" + "\n".join(msgs))
 
     def _update_counts(self):
-        inside = sum(1 for a in self.animals.values() if getattr(a, "inside", True))
-        outside = max(0, len(self.animals) - inside)
+        inside = int(np.count_nonzero(self.pool.inside & self.pool.alive))
+        outside = max(0, len(self.pool) - inside)
         self.status_inside.set(inside)
         self.status_outside.set(outside)
 
-    def log(self, text):
+    def log(self, text, ts=None):
+        # buffer messages and refresh the Text widget at most every 200 ms;
+        # inserting per event reflows the widget and grows it without bound.
+        # callers emitting many messages in one tick pass a shared timestamp
+        if ts is None:
+            ts = time.strftime('%H:%M:%S')
+        self._log_buf.append(f"[{ts}] {text}")
+        if self._log_flush_job is None:
+            self._log_flush_job = self.after(200, self._log_flush)
+
+    def _log_flush(self):
+        self._log_flush_job = None
         self.log_text.config(state="normal")
-        self.log_text.insert("end", f"[{time.strftime('%H:%M:%S')}] {text}\n")
+        self.log_text.delete("1.0", "end")
+        self.log_text.insert("end", "\n".join(self._log_buf))
         self.log_text.see("end")
         self.log_text.config(state="disabled")
 
@@ -417,11 +811,12 @@ class VirtualFenceApp(tk.Tk):
         fpath = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV Files","*.csv")], initialfile="virtual_fence_alerts.csv")
         if not fpath: return
         try:
-            with open(fpath, "w", newline="") as f:
+            # writerows loops the alert list at C level, and the large
+            # buffer keeps big histories from flushing per line
+            with open(fpath, "w", newline="", buffering=1<<20) as f:
                 writer = csv.writer(f)
                 writer.writerow(["timestamp","animal_id","x","y","message"])
-                for row in self.alerts:
-                    writer.writerow(row)
+                writer.writerows(self.alerts)
             messagebox.showinfo("Export", f"Exported alerts to {fpath}")
         except Exception as e:
             messagebox.showerror("Export error", str(e))
@@ -435,8 +830,10 @@ class VirtualFenceApp(tk.Tk):
             "speed_mul": float(self.speed_mul.get()),
             "animal_size": int(self.animal_size.get()),
             "fence_color": self.fence_color.get(),
-            "polygon_points": self.polygon_points,
-            "animals": [(a.id, a.x, a.y, a.base_speed, a.speed_multiplier) for a in self.animals.values()]
+            "polygon_points": self._poly_np.tolist() if self._poly_np is not None else [],
+            "animals": [(int(self.pool.id[s]), float(self.pool.x[s]), float(self.pool.y[s]),
+                         float(self.pool.base_speed[s]), float(self.pool.mult[s]))
+                        for s in sorted(self.pool.alive_indices(), key=lambda s: self.pool.id[s])]
         }
         fpath = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files","*.json")], initialfile="virtual_fence_config.json")
         if not fpath: return
@@ -457,6 +854,8 @@ class VirtualFenceApp(tk.Tk):
             self.canvas.config(width=cfg.get("canvas_w", self.canvas_w.get()), height=cfg.get("canvas_h", self.canvas_h.get()))
             self.canvas_w.set(cfg.get("canvas_w", self.canvas_w.get()))
             self.canvas_h.set(cfg.get("canvas_h", self.canvas_h.get()))
+            self._w = self.canvas_w.get()
+            self._h = self.canvas_h.get()
             self.tick_ms.set(cfg.get("tick_ms", self.tick_ms.get()))
             self.init_animal_count.set(cfg.get("init_animal_count", self.init_animal_count.get()))
             self.speed_mul.set(cfg.get("speed_mul", self.speed_mul.get()))
@@ -465,26 +864,23 @@ class VirtualFenceApp(tk.Tk):
             self.color_preview.config(bg=self.fence_color.get())
             pts = cfg.get("polygon_points", [])
             self.polygon_points = [(float(x), float(y)) for x,y in pts] if pts else []
-            # redraw fence
-            if self.fence_polygon_id:
-                self.canvas.delete(self.fence_polygon_id)
-                self.fence_polygon_id = None
+            # redraw fence by updating the persistent item
             if len(self.polygon_points) >= 3:
                 flat = [coord for pt in self.polygon_points for coord in pt]
-                self.fence_polygon_id = self.canvas.create_polygon(*flat, outline=self.fence_color.get(), width=3, fill="", dash=(6,4), tags=("fence",))
+                self.canvas.coords(self.fence_polygon_id, *flat)
+                self.canvas.itemconfig(self.fence_polygon_id, outline=self.fence_color.get(), state="normal")
+            else:
+                self.canvas.itemconfig(self.fence_polygon_id, state="hidden")
+            self._rebuild_poly_edges()
             # load animals (replace existing)
-            for a in list(self.animals.values()):
-                if a.canvas_obj: self.canvas.delete(a.canvas_obj)
-            self.animals = {}
-            self.next_animal_id = 1
+            self._clear_animals()
             for entry in cfg.get("animals", []):
                 try:
                     aid, x, y, base, mult = entry
-                    self._create_animal(float(x), float(y))
+                    slot = self._create_animal(float(x), float(y))
                     # update base speed if desired
-                    new = self.animals[self.next_animal_id-1]
-                    new.base_speed = float(base)
-                    new.speed_multiplier = float(mult)
+                    self.pool.base_speed[slot] = float(base)
+                    self.pool.mult[slot] = float(mult)
                 except Exception:
                     continue
             self.log(f"Config loaded from {fpath}")
@@ -495,6 +891,7 @@ class VirtualFenceApp(tk.Tk):
     def on_close(self):
         if self.sim_running and not messagebox.askokcancel("Quit", "Simulation running. Quit anyway?"): return
         self.stop_simulation()
+        self._exec.shutdown(wait=False)
         self.destroy()
 
 def main():